@@ -3,25 +3,247 @@ import os
 import sys
 from datetime import datetime, date
 from typing import List, Dict, Optional
-import argparse
+from operator import attrgetter
+from bisect import bisect_right
+
+try:
+    import orjson
+
+    def _dumps(data):
+        """Серіалізує дані у JSON (UTF-8 байти) з відступами"""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    def _dumps_line(data):
+        """Серіалізує дані у компактний однорядковий JSON (UTF-8 байти)"""
+        return orjson.dumps(data)
+
+    def _loads(raw):
+        """Десеріалізує JSON з байтів"""
+        return orjson.loads(raw)
+except ImportError:  # orjson не встановлено - використовуємо стандартний json
+    def _dumps(data):
+        """Серіалізує дані у JSON (UTF-8 байти) з відступами"""
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+    def _dumps_line(data):
+        """Серіалізує дані у компактний однорядковий JSON (UTF-8 байти)"""
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def _loads(raw):
+        """Десеріалізує JSON з байтів"""
+        return json.loads(raw)
+
+# Стовпці NumPy окупаються лише на великих списках; numpy (~50 мс) імпортується ліниво
+_VECTORIZE_MIN_TASKS = 1000
+np = None
+_numpy_loaded = False
+
+def _load_numpy():
+    """Імпортує numpy при першому виклику; повертає модуль або None, якщо не встановлено"""
+    global np, _numpy_loaded
+    if not _numpy_loaded:
+        _numpy_loaded = True
+        try:
+            import numpy
+        except ImportError:  # numpy не встановлено - фільтри працюють на чистому Python
+            return None
+        np = numpy
+    return np
+
+# Процес-демон живе довго, тож лише в ньому окупаються кеші, що будуються один раз
+# на багато команд (JIT-ядро, буфер назв для пошуку). Встановлюється в serve_daemon.
+_daemon_mode = False
+
+# Імпорт numba та завантаження кешу ядра займають ~0.5 с, а виграш - ~1 мс на виклик,
+# тож JIT використовується лише в демоні і лише для великих списків
+_JIT_MIN_TASKS = 5000
+_upcoming_kernel = None
+_jit_loaded = False
+
+def _upcoming_mask(ords, completed, today_ord, days):
+    """Повертає індекси завдань з терміном у межах days днів та к-сть днів до терміну
+
+    Значення -1 в ords означає відсутній термін. Компілюється numba в _get_upcoming_kernel.
+    """
+    n = ords.shape[0]
+    indices = np.empty(n, np.int64)
+    days_left = np.empty(n, np.int64)
+    count = 0
+    for i in range(n):
+        ordinal = ords[i]
+        if ordinal < 0 or completed[i]:
+            continue
+        left = ordinal - today_ord
+        if 0 <= left <= days:
+            indices[count] = i
+            days_left[count] = left
+            count += 1
+    return indices[:count], days_left[:count]
+
+def _get_upcoming_kernel():
+    """Повертає JIT-скомпільований _upcoming_mask або None, якщо numba не встановлено"""
+    global _upcoming_kernel, _jit_loaded
+    if not _jit_loaded:
+        _jit_loaded = True
+        try:
+            from numba import njit
+        except ImportError:
+            return None
+        _upcoming_kernel = njit(cache=True)(_upcoming_mask)
+    return _upcoming_kernel
+
+# Числовий ранг пріоритету для сортування та статистики
+_PRIORITY_RANK = {"високий": 3, "середній": 2, "низький": 1}
+
+# Розмір буфера для експорту/імпорту CSV
+_IO_BUFFER_SIZE = 1 << 20
+
+# Скільки секунд демон чекає на дані клієнта, щоб завислий клієнт не блокував інших
+_DAEMON_CONN_TIMEOUT = 5.0
+
+def _parse_due_date(due_date):
+    """Перетворює рядок YYYY-MM-DD на date або повертає None"""
+    if not due_date:
+        return None
+    try:
+        return date.fromisoformat(due_date)
+    except ValueError:
+        return None
+
+def _is_tty():
+    """Чи введення йде з інтерактивного терміналу (sys.stdin буває None, напр. під pythonw)"""
+    return sys.stdin is not None and sys.stdin.isatty()
+
+_MENU = """
+Оберіть дію:
+1. Додати нове завдання
+2. Показати всі завдання
+3. Позначити завдання як виконане
+4. Видалити завдання
+5. Показати статистику
+6. Фільтрувати завдання
+7. Пошук завдань
+8. Експорт завдань
+9. Імпорт завдань
+0. Вийти
+"""
+
+def _ask(prompt):
+    """Зчитує рядок введення напряму з stdin (швидше за input() для скриптів)"""
+    if sys.stdin is None:
+        raise EOFError
+    sys.stdout.write(prompt)
+    if _is_tty():
+        sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+def _print_tasks(header, tasks):
+    """Виводить заголовок і список завдань одним записом у stdout"""
+    sys.stdout.write("\n".join((header, *map(str, tasks))) + "\n")
 
 class Task:
+    # Без __dict__ на кожен екземпляр: менше пам'яті та швидший доступ до атрибутів
+    # title, completed, priority, due_date та tags - властивості: їх сетери оновлюють
+    # похідні кеші та сповіщають менеджер (журнал, лічильники, індекси)
+    __slots__ = ('id', 'created_at', '_title', '_completed', '_priority', '_due_date', '_tags',
+                 '_title_lower', '_due_date_obj', '_due_ord', '_priority_rank', '_cached_dict',
+                 '_owner')
+    
     def __init__(self, title, priority=None, due_date=None):
+        self._cached_dict = None  # Результат to_dict, скидається при зміні завдання
+        self._owner = None  # TaskManager, якого сповіщають про зміни завдання
         self.id = None  # ID буде призначено пізніше
         self.title = title
         self.completed = False
         self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # Виправлено datetime.datetime.now()
         self.priority = priority
         self.due_date = due_date
-        self.tags = []  # Додано для підтримки тегів
+        self.tags = set()  # Множина тегів: перевірка наявності за O(1)
     
     def __str__(self):
         status = "✓" if self.completed else "✗"
         priority = f" [{self.priority}]" if self.priority else ""
         due_date = f" (до {self.due_date})" if self.due_date else ""
-        tags = f" #{','.join(self.tags)}" if self.tags else ""
+        tags = f" #{','.join(sorted(self.tags))}" if self.tags else ""
         return f"{self.id}. {status} {self.title}{priority}{due_date}{tags}"
     
+    def _changing(self):
+        """Сповіщає менеджер, що містить завдання, перед зміною полів"""
+        if self._owner is not None:
+            self._owner._before_task_change(self)
+    
+    def _changed(self):
+        """Скидає кеш to_dict та сповіщає менеджер, що містить завдання"""
+        self._cached_dict = None
+        if self._owner is not None:
+            self._owner._after_task_change(self)
+    
+    @property
+    def title(self):
+        return self._title
+    
+    @title.setter
+    def title(self, title):
+        self._changing()
+        self._title = title
+        self._title_lower = title.lower()  # Кеш для пошуку без повторного lower()
+        self._changed()
+    
+    @property
+    def completed(self):
+        return self._completed
+    
+    @completed.setter
+    def completed(self, completed):
+        self._changing()
+        self._completed = bool(completed)
+        self._changed()
+    
+    @property
+    def priority(self):
+        return self._priority
+    
+    @priority.setter
+    def priority(self, priority):
+        self._changing()
+        self._priority = priority
+        self._priority_rank = _PRIORITY_RANK.get(priority, 0)
+        self._changed()
+    
+    @property
+    def due_date(self):
+        return self._due_date
+    
+    @due_date.setter
+    def due_date(self, due_date):
+        self._changing()
+        self._due_date = due_date
+        self._due_date_obj = _parse_due_date(due_date)  # Кеш розібраної дати
+        # Порядковий номер дати для сортування, -1 - без терміну
+        self._due_ord = -1 if self._due_date_obj is None else self._due_date_obj.toordinal()
+        self._changed()
+    
+    @property
+    def tags(self):
+        return self._tags
+    
+    @tags.setter
+    def tags(self, tags):
+        self._changing()
+        self._tags = tags
+        self._changed()
+    
+    def set_title(self, title):
+        """Змінює назву завдання"""
+        self.title = title
+    
+    def set_priority(self, priority):
+        """Змінює пріоритет завдання"""
+        self.priority = priority
+    
     def mark_completed(self):
         """Позначає завдання як виконане"""
         self.completed = True
@@ -29,16 +251,21 @@ class Task:
     def add_tag(self, tag):
         """Додає тег до завдання"""
         if tag and tag not in self.tags:
-            self.tags.append(tag)
+            self._changing()
+            self.tags.add(tag)
+            self._changed()
     
     def to_dict(self):
         """Конвертує завдання в словник для збереження"""
+        if self._cached_dict is not None:
+            return self._cached_dict
+        
         task_dict = {
             "id": self.id,
             "title": self.title,
             "completed": self.completed,
             "created_at": self.created_at,
-            "tags": self.tags
+            "tags": sorted(self.tags)  # Відсортовано для стабільного JSON
         }
         
         if self.priority:
@@ -47,6 +274,7 @@ class Task:
         if self.due_date:
             task_dict["due_date"] = self.due_date
         
+        self._cached_dict = task_dict
         return task_dict
     
     @classmethod
@@ -58,64 +286,246 @@ class Task:
         task.id = data["id"]
         task.completed = data["completed"]
         task.created_at = data["created_at"]
-        task.tags = data.get("tags", [])
+        task.tags = set(data.get("tags", []))
         return task
 
 class TaskManager:
     """Основний клас для керування завданнями"""
     
     def __init__(self):
-        self.tasks = []
+        self.tasks = {}  # ID -> Task, порядок додавання зберігається
         self.filename = "tasks.json"
+        self._max_id = 0
+        # Журнал змін: операції з моменту завантаження дописуються у .log замість
+        # повного перезапису файлу. Дозволено лише якщо файл завантажено цим менеджером.
+        self._pending_ops = []
+        self._pending_ids = set()  # ID завдань, чий поточний стан уже запише операція add/update
+        self._journal_ok = False
+        # Лічильники для статистики за O(1), оновлюються при кожній зміні
+        self._completed_count = 0
+        self._high_prio_active_count = 0
+        # Стовпці (SoA) для get_upcoming_tasks на великих списках, перебудовуються після змін
+        self._task_refs = []
+        self._arr_completed = None
+        self._arr_due = None
+        self._arrays_dirty = True
+        # Назви в нижньому регістрі, склеєні через "\x00", для пошуку одним find()
+        self._search_refs = []
+        self._titles_blob = ""
+        self._title_offsets = []
+        self._search_dirty = True
+        # Стан файлів на диску після останнього завантаження чи збереження цим менеджером
+        self._disk_state = None
     
     def add_task(self, title, priority=None, due_date=None):
         """Додає нове завдання"""
         task = Task(title, priority, due_date)
-        task.id = self._generate_id()
-        self.tasks.append(task)
+        self._max_id += 1
+        task.id = self._max_id
+        task._owner = self
+        self.tasks[task.id] = task
+        self._count_task(task, 1)
+        self._pending_ops.append(("add", task))
+        self._pending_ids.add(task.id)
+        self._arrays_dirty = True
+        self._search_dirty = True
         return task
     
     def _generate_id(self):
         """Генерує унікальний ID для завдання"""
-        if not self.tasks:
-            return 1
-        return max(task.id for task in self.tasks) + 1
+        return self._max_id + 1
+    
+    def _count_task(self, task, sign):
+        """Оновлює лічильники статистики при додаванні (sign=1) або видаленні (sign=-1) завдання"""
+        if task.completed:
+            self._completed_count += sign
+        elif task._priority_rank == 3:  # "високий"
+            self._high_prio_active_count += sign
+    
+    def _recount(self):
+        """Перераховує лічильники статистики за один прохід"""
+        self._completed_count = self._high_prio_active_count = 0
+        for task in self.tasks.values():
+            self._count_task(task, 1)
+    
+    def _update_max_id(self):
+        """Оновлює лічильник ID після завантаження або імпорту"""
+        self._max_id = max(self.tasks, default=0)
+    
+    def _add_imported_tasks(self, imported_tasks):
+        """Призначає імпортованим завданням послідовні ID та додає їх одним пакетом"""
+        start = self._generate_id()
+        for i, task in enumerate(imported_tasks):
+            task.id = start + i
+            task._owner = self
+        
+        self.tasks.update({task.id: task for task in imported_tasks})
+        self._max_id = start + len(imported_tasks) - 1
+        for task in imported_tasks:
+            self._count_task(task, 1)
+        self._pending_ops.extend(("add", task) for task in imported_tasks)
+        self._pending_ids.update(task.id for task in imported_tasks)
+        self._arrays_dirty = True
+        self._search_dirty = True
+    
+    def _before_task_change(self, task):
+        """Викликається Task перед зміною його полів: знімає завдання з лічильників"""
+        if self.tasks.get(task.id) is task:
+            self._count_task(task, -1)
+    
+    def _after_task_change(self, task):
+        """Викликається Task після зміни його полів: оновлює лічильники та скидає кеші"""
+        if self.tasks.get(task.id) is not task:  # Завдання вже видалено або замінено
+            return
+        self._count_task(task, 1)
+        self._arrays_dirty = True
+        self._search_dirty = True
+        # Стан завдання серіалізується під час save_tasks, тож досить однієї операції
+        if task.id not in self._pending_ids:
+            self._pending_ops.append(("update", task))
+            self._pending_ids.add(task.id)
     
     def get_all_tasks(self):
         """Повертає всі завдання"""
-        return self.tasks
+        return list(self.tasks.values())
     
     def complete_task(self, task_id):
         """Позначає завдання як виконане"""
-        for task in self.tasks:
-            if task.id == task_id:
-                task.mark_completed()
-                return True
-        return False
+        task = self.tasks.get(task_id)
+        if task is None:
+            return False
+        task.mark_completed()  # Лічильники та журнал оновлює _after_task_change
+        return True
     
     def delete_task(self, task_id):
         """Видаляє завдання за ID"""
-        for i, task in enumerate(self.tasks):
-            if task.id == task_id:
-                del self.tasks[i]
-                return True
-        return False
+        task = self.tasks.pop(task_id, None)
+        if task is None:
+            return False
+        self._count_task(task, -1)
+        self._pending_ops.append(("delete", task_id))
+        self._pending_ids.discard(task_id)
+        self._arrays_dirty = True
+        self._search_dirty = True
+        return True
+    
+    def _journal_filename(self):
+        """Повертає ім'я файлу журналу змін (tasks.json -> tasks.log)"""
+        return os.path.splitext(self.filename)[0] + ".log"
+    
+    def _read_disk_state(self):
+        """Повертає (inode, mtime, розмір) файлу завдань і журналу, None - якщо файлу немає"""
+        state = []
+        for filename in (self.filename, self._journal_filename()):
+            try:
+                st = os.stat(filename)
+            except FileNotFoundError:
+                state.append(None)
+            else:
+                state.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        return tuple(state)
+    
+    def is_stale(self):
+        """Чи змінив файли інший процес після останнього завантаження чи збереження"""
+        return self._read_disk_state() != self._disk_state
     
     def load_tasks(self):
-        """Завантажує завдання з файлу"""
+        """Завантажує завдання з файлу та застосовує журнал змін"""
         try:
-            with open(self.filename, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                self.tasks = [Task.from_dict(task_data) for task_data in data]
-            return True
+            with open(self.filename, 'rb') as file:
+                data = _loads(file.read())
+                self.tasks = {task.id: task for task in map(Task.from_dict, data)}
         except FileNotFoundError:
+            self._disk_state = self._read_disk_state()
             return False
+        
+        # Якщо журнал обірвано, наступне збереження перезапише файл повністю
+        self._journal_ok = self._replay_journal()
+        for task in self.tasks.values():
+            task._owner = self
+        self._update_max_id()
+        self._recount()
+        self._pending_ops = []
+        self._pending_ids = set()
+        self._arrays_dirty = True
+        self._search_dirty = True
+        self._disk_state = self._read_disk_state()
+        return True
+    
+    def _replay_journal(self):
+        """Застосовує операції з журналу до завантажених завдань
+        
+        Returns:
+            bool: True, якщо журнал не містить обірваних чи пошкоджених записів
+        """
+        try:
+            with open(self._journal_filename(), 'rb') as file:
+                raw = file.read()
+        except FileNotFoundError:
+            return True
+        
+        # Останній рядок без "\n" - обірваний запис, його пропускаємо
+        for line in raw.split(b"\n")[:-1]:
+            try:
+                op = _loads(line)
+                if op["op"] in ("add", "update"):
+                    task = Task.from_dict(op["task"])
+                    self.tasks[task.id] = task
+                elif op["op"] == "complete":  # Формат старих журналів, зараз пишеться update
+                    task = self.tasks.get(op["id"])
+                    if task is not None:
+                        task.mark_completed()
+                elif op["op"] == "delete":
+                    self.tasks.pop(op["id"], None)
+            except (ValueError, KeyError, TypeError):
+                # Пошкоджений запис: подальші операції могли від нього залежати,
+                # тому зупиняємось, а наступне збереження перезапише файл повністю
+                print("Помилка в журналі змін: застосовано лише записи до пошкодженого")
+                return False
+        
+        return not raw or raw.endswith(b"\n")
     
     def save_tasks(self):
-        """Зберігає завдання у файл"""
-        with open(self.filename, 'w', encoding='utf-8') as file:
-            data = [task.to_dict() for task in self.tasks]
-            json.dump(data, file, ensure_ascii=False, indent=2)
+        """Зберігає завдання: дописує зміни в журнал або повністю перезаписує файл"""
+        if not self._journal_ok:
+            self.compact_tasks()
+            return
+        if not self._pending_ops:
+            return
+        
+        lines = []
+        for op, value in self._pending_ops:
+            if op in ("add", "update"):
+                lines.append(_dumps_line({"op": op, "task": value.to_dict()}))
+            else:
+                lines.append(_dumps_line({"op": op, "id": value}))
+        
+        with open(self._journal_filename(), 'ab') as file:
+            file.write(b"\n".join(lines) + b"\n")
+            journal_size = file.tell()
+        self._pending_ops = []
+        self._pending_ids = set()
+        
+        if journal_size > 2 * os.path.getsize(self.filename):
+            self.compact_tasks()
+        else:
+            self._disk_state = self._read_disk_state()
+    
+    def compact_tasks(self):
+        """Атомарно перезаписує файл завдань повністю та очищує журнал"""
+        tmp_filename = self.filename + ".tmp"
+        with open(tmp_filename, 'wb') as file:
+            data = [task.to_dict() for task in self.tasks.values()]
+            file.write(_dumps(data))
+        os.replace(tmp_filename, self.filename)
+        
+        # Після заміни файлу журнал вже врахований у ньому
+        with open(self._journal_filename(), 'wb'):
+            pass
+        self._pending_ops = []
+        self._pending_ids = set()
+        self._journal_ok = True
+        self._disk_state = self._read_disk_state()
     
     def list_tasks(self, status=None, priority=None):
         """Показує список завдань з можливістю фільтрації
@@ -124,7 +534,7 @@ class TaskManager:
             status (bool, optional): Фільтр за статусом (True - виконані, False - активні)
             priority (str, optional): Фільтр за пріоритетом
         """
-        filtered_tasks = self.tasks
+        filtered_tasks = self.tasks.values()
         
         if status is not None:
             filtered_tasks = [task for task in filtered_tasks if task.completed == status]
@@ -132,7 +542,7 @@ class TaskManager:
         if priority:
             filtered_tasks = [task for task in filtered_tasks if task.priority == priority]
         
-        return filtered_tasks
+        return list(filtered_tasks)
     
     def get_task_by_id(self, task_id):
         """Знаходить завдання за ID
@@ -143,10 +553,7 @@ class TaskManager:
         Returns:
             Task or None: Знайдене завдання або None, якщо не знайдено
         """
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None  # Виправлено "return None,"
+        return self.tasks.get(task_id)
     
     def search_tasks(self, keyword):
         """Пошук завдань за ключовим словом в назві
@@ -161,7 +568,40 @@ class TaskManager:
             return []
         
         keyword = keyword.lower()
-        return [task for task in self.tasks if keyword in task.title.lower()]
+        # Буфер окупається лише в довгоживучому демоні, де перебудовується рідко;
+        # "\x00" у ключовому слові збігався б із роздільниками буфера
+        if not _daemon_mode or "\x00" in keyword:
+            return [task for task in self.tasks.values() if keyword in task._title_lower]
+        
+        self._ensure_search_index()
+        blob = self._titles_blob
+        offsets = self._title_offsets
+        found = []
+        
+        pos = blob.find(keyword)
+        while pos != -1:
+            i = bisect_right(offsets, pos) - 1
+            found.append(self._search_refs[i])
+            if i + 1 == len(offsets):
+                break
+            # Продовжуємо з початку наступної назви, щоб не дублювати завдання
+            pos = blob.find(keyword, offsets[i + 1])
+        
+        return found
+    
+    def _ensure_search_index(self):
+        """Перебудовує буфер назв та зміщення їх початків, якщо були зміни"""
+        if not self._search_dirty:
+            return
+        refs = self._search_refs = list(self.tasks.values())
+        offsets = []
+        pos = 0
+        for task in refs:
+            offsets.append(pos)
+            pos += len(task._title_lower) + 1
+        self._titles_blob = "\x00".join(task._title_lower for task in refs)
+        self._title_offsets = offsets
+        self._search_dirty = False
     
     def filter_by_tag(self, tag):
         """Фільтрує завдання за тегом
@@ -172,7 +612,7 @@ class TaskManager:
         Returns:
             list: Список завдань з вказаним тегом
         """
-        return [task for task in self.tasks if tag in task.tags]
+        return [task for task in self.tasks.values() if tag in task.tags]
     
     def sort_tasks(self, tasks=None, by="id", reverse=False):
         """Сортує завдання за вказаним критерієм
@@ -186,39 +626,65 @@ class TaskManager:
             list: Відсортований список завдань
         """
         if tasks is None:
-            tasks = self.tasks
+            tasks = list(self.tasks.values())
         
         if by == "id":
-            return sorted(tasks, key=lambda t: t.id, reverse=reverse)
+            return sorted(tasks, key=attrgetter('id'), reverse=reverse)
         elif by == "title":
-            return sorted(tasks, key=lambda t: t.title.lower(), reverse=reverse)
+            return sorted(tasks, key=attrgetter('_title_lower'), reverse=reverse)
         elif by == "priority":
-            priority_order = {"високий": 3, "середній": 2, "низький": 1, None: 0}
-            return sorted(tasks, key=lambda t: priority_order.get(t.priority, 0), reverse=reverse)
+            return sorted(tasks, key=attrgetter('_priority_rank'), reverse=reverse)
         elif by == "due_date":
-            return sorted(tasks, key=lambda t: t.due_date if t.due_date else "9999-99-99", reverse=reverse)
+            return sorted(tasks, key=lambda t: (t._due_ord == -1, t._due_ord), reverse=reverse)
         elif by == "created_at":
-            return sorted(tasks, key=lambda t: t.created_at, reverse=reverse)
+            return sorted(tasks, key=attrgetter('created_at'), reverse=reverse)
         else:
             return tasks
     
+    def _use_arrays(self):
+        """Чи використовувати стовпці NumPy у get_upcoming_tasks: лише для великих списків"""
+        return len(self.tasks) >= _VECTORIZE_MIN_TASKS and _load_numpy() is not None
+    
+    def _ensure_arrays(self):
+        """Перебудовує стовпці статусу та терміну (-1 - без терміну), якщо були зміни"""
+        if not self._arrays_dirty:
+            return
+        refs = self._task_refs = list(self.tasks.values())
+        n = len(refs)
+        self._arr_completed = np.fromiter((task.completed for task in refs), dtype=bool, count=n)
+        self._arr_due = np.fromiter((task._due_ord for task in refs), dtype=np.int32, count=n)
+        self._arrays_dirty = False
+    
     def get_upcoming_tasks(self, days=7):
         """Повертає список завдань з наближаючимся терміном виконання"""
-        today = datetime.now().date()
+        today = date.today()
+        
+        if self._use_arrays():
+            self._ensure_arrays()
+            today_ord = today.toordinal()
+            kernel = None
+            if _daemon_mode and len(self._task_refs) >= _JIT_MIN_TASKS:
+                kernel = _get_upcoming_kernel()
+            if kernel is not None:
+                indices, days_left = kernel(self._arr_due, self._arr_completed, today_ord, days)
+            else:
+                days_left = self._arr_due - today_ord
+                mask = (~self._arr_completed) & (self._arr_due >= 0) & (days_left >= 0) & (days_left <= days)
+                indices = np.flatnonzero(mask)
+                days_left = days_left[indices]
+            upcoming = [(self._task_refs[i], int(left)) for i, left in zip(indices, days_left)]
+            return sorted(upcoming, key=lambda x: x[1])
+        
         upcoming = []
         
-        for task in self.tasks:
-            if task.completed or not task.due_date:
+        for task in self.tasks.values():
+            due_date = task._due_date_obj
+            if task.completed or due_date is None:
                 continue
             
-            try:
-                due_date = datetime.strptime(task.due_date, "%Y-%m-%d").date()
-                days_left = (due_date - today).days
-                
-                if 0 <= days_left <= days:
-                    upcoming.append((task, days_left))
-            except ValueError:
-                continue
+            days_left = (due_date - today).days
+            if 0 <= days_left <= days:
+                upcoming.append((task, days_left))
         
         return sorted(upcoming, key=lambda x: x[1])
     
@@ -226,26 +692,24 @@ class TaskManager:
         """Експортує завдання у файл"""
         try:
             if format.lower() == "json":
-                with open(filename, 'w', encoding='utf-8') as file:
-                    data = [task.to_dict() for task in self.tasks]
-                    json.dump(data, file, ensure_ascii=False, indent=2)
+                with open(filename, 'wb') as file:
+                    data = [task.to_dict() for task in self.tasks.values()]
+                    file.write(_dumps(data))
             elif format.lower() == "csv":
                 import csv
-                with open(filename, 'w', encoding='utf-8', newline='') as file:
+                with open(filename, 'w', encoding='utf-8', newline='',
+                          buffering=_IO_BUFFER_SIZE) as file:
                     writer = csv.writer(file)
                     writer.writerow(["ID", "Назва", "Статус", "Пріоритет", "Термін виконання", "Створено", "Теги"])
-                    
-                    for task in self.tasks:
-                        status = "Виконано" if task.completed else "Активно"
-                        writer.writerow([
-                            task.id,
-                            task.title,
-                            status,
-                            task.priority or "",
-                            task.due_date or "",
-                            task.created_at,
-                            ",".join(task.tags)
-                        ])
+                    writer.writerows(
+                        (task.id,
+                         task.title,
+                         "Виконано" if task.completed else "Активно",
+                         task.priority or "",
+                         task.due_date or "",
+                         task.created_at,
+                         ",".join(sorted(task.tags)))
+                        for task in self.tasks.values())
             else:
                 print(f"Непідтримуваний формат: {format}")
                 return False
@@ -260,23 +724,18 @@ class TaskManager:
         """Імпортує завдання з файлу"""
         try:
             if format.lower() == "json":
-                with open(filename, 'r', encoding='utf-8') as file:
-                    data = json.load(file)
-                    imported_tasks = [Task.from_dict(task_data) for task_data in data]
-                    
-                    next_id = self._generate_id()
-                    for task in imported_tasks:
-                        task.id = next_id
-                        next_id += 1
-                    
-                    self.tasks.extend(imported_tasks)
+                with open(filename, 'rb') as file:
+                    data = _loads(file.read())
+                    self._add_imported_tasks([Task.from_dict(task_data) for task_data in data])
                     
             elif format.lower() == "csv":
                 import csv
-                with open(filename, 'r', encoding='utf-8', newline='') as file:
+                with open(filename, 'r', encoding='utf-8', newline='',
+                          buffering=_IO_BUFFER_SIZE) as file:
                     reader = csv.reader(file)
                     headers = next(reader)
                     
+                    imported_tasks = []
                     for row in reader:
                         if len(row) >= 6:
                             title = row[1]
@@ -285,11 +744,12 @@ class TaskManager:
                             due_date = row[4] if row[4] else None
                             tags = row[6].split(",") if len(row) > 6 and row[6] else []
                             
-                            task = self.add_task(title, priority, due_date)
-                            if completed:
-                                task.mark_completed()
-                            for tag in tags:
-                                task.add_tag(tag.strip())
+                            task = Task(title, priority, due_date)
+                            task.completed = completed
+                            task.tags.update(tag for tag in (tag.strip() for tag in tags) if tag)
+                            imported_tasks.append(task)
+                    
+                    self._add_imported_tasks(imported_tasks)
                 
             else:
                 print(f"Непідтримуваний формат: {format}")
@@ -304,18 +764,18 @@ class TaskManager:
     def get_statistics(self):
         """Показує статистику завдань"""
         total = len(self.tasks)
-        completed = sum(1 for task in self.tasks if task.completed)
+        completed = self._completed_count
         active = total - completed
+        high_priority = self._high_prio_active_count
         
-        high_priority = sum(1 for task in self.tasks 
-                          if not task.completed and task.priority == "високий")
-        
-        print(f"\n📊 Статистика завдань:")
-        print("=" * 30)
-        print(f"📝 Всього завдань: {total}")
-        print(f"✅ Виконано: {completed}")
-        print(f"⏳ Активних: {active}")
-        print(f"🔴 Високий пріоритет (активні): {high_priority}")
+        sys.stdout.write("\n".join((
+            "\n📊 Статистика завдань:",
+            "=" * 30,
+            f"📝 Всього завдань: {total}",
+            f"✅ Виконано: {completed}",
+            f"⏳ Активних: {active}",
+            f"🔴 Високий пріоритет (активні): {high_priority}",
+        )) + "\n")
         
         return {
             "total": total,
@@ -324,128 +784,139 @@ class TaskManager:
             "high_priority": high_priority
         }
     
+    def _cli_add(self):
+        title = _ask("Введіть назву завдання: ")
+        priority = _ask("Введіть пріоритет (низький/середній/високий або Enter для пропуску): ")
+        due_date = _ask("Введіть термін виконання (YYYY-MM-DD або Enter для пропуску): ")
+        tags_input = _ask("Введіть теги через кому (або Enter для пропуску): ")
+        
+        priority = priority if priority else None
+        due_date = due_date if due_date else None
+        
+        task = self.add_task(title, priority, due_date)
+        
+        if tags_input:
+            tags = [tag.strip() for tag in tags_input.split(",")]
+            for tag in tags:
+                task.add_tag(tag)
+        
+        print(f"Завдання '{title}' додано!")
+    
+    def _cli_show_all(self):
+        tasks = self.get_all_tasks()
+        if not tasks:
+            print("Список завдань порожній.")
+        else:
+            _print_tasks("\nСписок завдань:", tasks)
+    
+    def _cli_complete(self):
+        task_id = _ask("Введіть ID завдання для позначення як виконане: ")
+        if task_id.isdigit():
+            if self.complete_task(int(task_id)):
+                print(f"Завдання з ID {task_id} позначено як виконане!")
+            else:
+                print(f"Завдання з ID {task_id} не знайдено.")
+        else:
+            print("Некоректний ID завдання.")
+    
+    def _cli_delete(self):
+        task_id = _ask("Введіть ID завдання для видалення: ")
+        if task_id.isdigit():
+            if self.delete_task(int(task_id)):
+                print(f"Завдання з ID {task_id} видалено!")
+            else:
+                print(f"Завдання з ID {task_id} не знайдено.")
+        else:
+            print("Некоректний ID завдання.")
+    
+    def _cli_statistics(self):
+        self.get_statistics()
+    
+    def _cli_filter(self):
+        status_input = _ask("Фільтрувати за статусом (1 - виконані, 0 - активні, Enter - всі): ")
+        priority_input = _ask("Фільтрувати за пріоритетом (низький/середній/високий або Enter для всіх): ")
+        
+        status = None
+        if status_input == "1":
+            status = True
+        elif status_input == "0":
+            status = False
+            
+        priority = priority_input if priority_input else None
+        
+        tasks = self.list_tasks(status, priority)
+        if not tasks:
+            print("Немає завдань, що відповідають фільтрам.")
+        else:
+            _print_tasks("\nВідфільтровані завдання:", tasks)
+    
+    def _cli_search(self):
+        keyword = _ask("Введіть ключове слово для пошуку: ")
+        tasks = self.search_tasks(keyword)
+        if not tasks:
+            print("Завдання не знайдено.")
+        else:
+            _print_tasks("\nЗнайдені завдання:", tasks)
+    
+    def _cli_export(self):
+        filename = _ask("Введіть ім'я файлу для експорту: ")
+        format_choice = _ask("Введіть формат (json/csv): ").lower()
+        self.export_tasks(filename, format_choice)
+    
+    def _cli_import(self):
+        filename = _ask("Введіть ім'я файлу для імпорту: ")
+        format_choice = _ask("Введіть формат (json/csv): ").lower()
+        self.import_tasks(filename, format_choice)
+    
+    def _cli_exit(self):
+        self.save_tasks()
+        print("Завдання збережено. До побачення!")
+        return True
+    
+    # Пункти меню інтерактивного режиму -> обробники
+    _CLI_DISPATCH = {
+        "1": _cli_add,
+        "2": _cli_show_all,
+        "3": _cli_complete,
+        "4": _cli_delete,
+        "5": _cli_statistics,
+        "6": _cli_filter,
+        "7": _cli_search,
+        "8": _cli_export,
+        "9": _cli_import,
+        "0": _cli_exit,
+    }
+    
     def run_cli(self):
         """Інтерактивний режим роботи"""
-        print("\n🗒️  Розумний CLI Менеджер Завдань 🗒️")
-        print("=" * 40)
+        # Меню та банери виводяться лише в інтерактивному терміналі, не при введенні з конвеєра
+        tty = _is_tty()
+        if tty:
+            print("\n🗒️  Розумний CLI Менеджер Завдань 🗒️")
+            print("=" * 40)
         
         self.load_tasks()
         
         while True:
-            print("\nОберіть дію:")
-            print("1. Додати нове завдання")
-            print("2. Показати всі завдання")
-            print("3. Позначити завдання як виконане")
-            print("4. Видалити завдання")
-            print("5. Показати статистику")
-            print("6. Фільтрувати завдання")
-            print("7. Пошук завдань")
-            print("8. Експорт завдань")
-            print("9. Імпорт завдань")
-            print("0. Вийти")
-            
-            choice = input("\nВаш вибір: ")
+            if tty:
+                sys.stdout.write(_MENU)
             
-            if choice == "1":
-                title = input("Введіть назву завдання: ")
-                priority = input("Введіть пріоритет (низький/середній/високий або Enter для пропуску): ")
-                due_date = input("Введіть термін виконання (YYYY-MM-DD або Enter для пропуску): ")
-                tags_input = input("Введіть теги через кому (або Enter для пропуску): ")
-                
-                priority = priority if priority else None
-                due_date = due_date if due_date else None
-                
-                task = self.add_task(title, priority, due_date)
-                
-                if tags_input:
-                    tags = [tag.strip() for tag in tags_input.split(",")]
-                    for tag in tags:
-                        task.add_tag(tag)
-                
-                print(f"Завдання '{title}' додано!")
-                
-            elif choice == "2":
-                tasks = self.get_all_tasks()
-                if not tasks:
-                    print("Список завдань порожній.")
-                else:
-                    print("\nСписок завдань:")
-                    for task in tasks:
-                        print(task)
-                        
-            elif choice == "3":
-                task_id = input("Введіть ID завдання для позначення як виконане: ")
-                if task_id.isdigit():
-                    if self.complete_task(int(task_id)):
-                        print(f"Завдання з ID {task_id} позначено як виконане!")
-                    else:
-                        print(f"Завдання з ID {task_id} не знайдено.")
-                else:
-                    print("Некоректний ID завдання.")
-                    
-            elif choice == "4":
-                task_id = input("Введіть ID завдання для видалення: ")
-                if task_id.isdigit():
-                    if self.delete_task(int(task_id)):
-                        print(f"Завдання з ID {task_id} видалено!")
-                    else:
-                        print(f"Завдання з ID {task_id} не знайдено.")
-                else:
-                    print("Некоректний ID завдання.")
-                    
-            elif choice == "5":
-                self.get_statistics()
-                
-            elif choice == "6":
-                status_input = input("Фільтрувати за статусом (1 - виконані, 0 - активні, Enter - всі): ")
-                priority_input = input("Фільтрувати за пріоритетом (низький/середній/високий або Enter для всіх): ")
-                
-                status = None
-                if status_input == "1":
-                    status = True
-                elif status_input == "0":
-                    status = False
-                    
-                priority = priority_input if priority_input else None
-                
-                tasks = self.list_tasks(status, priority)
-                if not tasks:
-                    print("Немає завдань, що відповідають фільтрам.")
-                else:
-                    print("\nВідфільтровані завдання:")
-                    for task in tasks:
-                        print(task)
-                        
-            elif choice == "7":
-                keyword = input("Введіть ключове слово для пошуку: ")
-                tasks = self.search_tasks(keyword)
-                if not tasks:
-                    print("Завдання не знайдено.")
-                else:
-                    print("\nЗнайдені завдання:")
-                    for task in tasks:
-                        print(task)
-                        
-            elif choice == "8":
-                filename = input("Введіть ім'я файлу для експорту: ")
-                format_choice = input("Введіть формат (json/csv): ").lower()
-                self.export_tasks(filename, format_choice)
-                
-            elif choice == "9":
-                filename = input("Введіть ім'я файлу для імпорту: ")
-                format_choice = input("Введіть формат (json/csv): ").lower()
-                self.import_tasks(filename, format_choice)
-                        
-            elif choice == "0":
-                self.save_tasks()
-                print("Завдання збережено. До побачення!")
+            try:
+                choice = _ask("\nВаш вибір: ")
+                handler = self._CLI_DISPATCH.get(choice)
+                if handler is None:
+                    print("Некоректний вибір. Спробуйте ще раз.")
+                elif handler(self):
+                    break
+            except EOFError:
+                # Кінець введення (наприклад, скрипт через конвеєр) - зберігаємо та виходимо
+                self._cli_exit()
                 break
-                
-            else:
-                print("Некоректний вибір. Спробуйте ще раз.")
 
 def create_parser():
     """Створює парсер аргументів командного рядка"""
+    import argparse  # Імпортується лише для командного режиму
+    
     parser = argparse.ArgumentParser(description='Розумний CLI Менеджер Завдань')
     subparsers = parser.add_subparsers(dest='command', help='Команди')
     
@@ -474,6 +945,9 @@ def create_parser():
     # Команда перегляду статистики
     subparsers.add_parser('stats', help='Показати статистику завдань')
     
+    # Команда запуску демона, що тримає завдання в пам'яті між командами
+    subparsers.add_parser('taskd', help="Запустити демон (клієнт використовує його при TASKS_DAEMON=1)")
+    
     return parser
 
 def interactive_mode():
@@ -481,52 +955,204 @@ def interactive_mode():
     manager = TaskManager()
     manager.run_cli()
 
+def execute_command(manager, command):
+    """Виконує команду командного рядка над менеджером завдань
+    
+    Args:
+        manager (TaskManager): Менеджер із завантаженими завданнями
+        command (dict): Аргументи команди (vars() від результату parse_args)
+        
+    Returns:
+        bool: False, якщо команда невідома
+    """
+    name = command.get('command')
+    
+    if name == 'add':
+        manager.add_task(command['name'], command['priority'], command['due'])
+        manager.save_tasks()
+        print(f"Завдання '{command['name']}' додано!")
+    
+    elif name == 'list':
+        status = True if command['status'] == 'completed' else False if command['status'] == 'active' else None
+        tasks = manager.list_tasks(status, command['priority'])
+        if not tasks:
+            print("Немає завдань, що відповідають фільтрам.")
+        else:
+            _print_tasks("\nСписок завдань:", tasks)
+    
+    elif name == 'complete':
+        if manager.complete_task(command['id']):
+            print(f"Завдання з ID {command['id']} позначено як виконане!")
+        else:
+            print(f"Завдання з ID {command['id']} не знайдено.")
+        manager.save_tasks()
+    
+    elif name == 'delete':
+        if manager.delete_task(command['id']):
+            print(f"Завдання з ID {command['id']} видалено!")
+        else:
+            print(f"Завдання з ID {command['id']} не знайдено.")
+        manager.save_tasks()
+    
+    elif name == 'stats':
+        manager.get_statistics()
+    
+    else:
+        return False
+    
+    return True
+
+def _socket_path():
+    """Повертає шлях до Unix-сокета демона"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:  # Приватний каталог користувача
+        return os.path.join(runtime_dir, "tasks.sock")
+    
+    # Спільний тимчасовий каталог: ім'я сокета містить UID, щоб не перетинатися з іншими
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), f"tasks-{os.getuid()}.sock")
+
+def _socket_foreign(path):
+    """Чи існує сокет, створений іншим користувачем (такому сокету не довіряємо)"""
+    try:
+        return os.lstat(path).st_uid != os.getuid()
+    except FileNotFoundError:
+        return False
+
+def _recv_all(conn):
+    """Читає з сокета всі дані до закриття з'єднання"""
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+def serve_daemon():
+    """Запускає демон, що тримає завдання в пам'яті та виконує команди з Unix-сокета"""
+    import contextlib
+    import io
+    import signal
+    import socket
+    
+    global _daemon_mode
+    _daemon_mode = True
+    
+    # SIGTERM зупиняє демон так само, як Ctrl+C: зі збереженням завдань
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    
+    path = _socket_path()
+    managers = {}  # Абсолютний шлях до файлу завдань клієнта -> TaskManager
+    
+    if _socket_foreign(path):
+        print(f"Сокет {path} належить іншому користувачу, демон не запущено.")
+        return
+    
+    # Живий сокет означає, що демон уже працює; інакше це залишок після збою
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            pass
+        else:
+            print(f"Демон завдань вже працює: {path}")
+            return
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+    
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(path)
+        server.listen()
+        print(f"Демон завдань слухає {path}")
+        
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    conn.settimeout(_DAEMON_CONN_TIMEOUT)
+                    try:
+                        raw = _recv_all(conn)
+                    except (socket.timeout, ConnectionResetError):  # Клієнт завис або обірвав запит
+                        continue
+                    if not raw:  # Порожнє з'єднання - перевірка, чи демон вже працює
+                        continue
+                    output = io.StringIO()
+                    with contextlib.redirect_stdout(output):
+                        try:
+                            command = _loads(raw)
+                            filename = command["filename"]
+                            manager = managers.get(filename)
+                            # Файли міг змінити інший процес: перечитуємо, щоб не затерти його зміни
+                            if manager is None or manager.is_stale():
+                                manager = managers[filename] = TaskManager()
+                                manager.filename = filename
+                                manager.load_tasks()
+                            if not execute_command(manager, command):
+                                print(f"Невідома команда: {command.get('command')}")
+                        except Exception as e:
+                            print(f"Помилка при виконанні команди: {e}")
+                    with contextlib.suppress(BrokenPipeError, ConnectionResetError, socket.timeout):
+                        conn.sendall(output.getvalue().encode('utf-8'))
+        except KeyboardInterrupt:
+            print("\n👋 Демон зупинено.")
+        finally:
+            for manager in managers.values():
+                manager.save_tasks()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+
+def send_to_daemon(command):
+    """Надсилає команду демону та повертає його вивід
+    
+    Args:
+        command (dict): Аргументи команди з абсолютним шляхом до файлу завдань у "filename"
+        
+    Returns:
+        str or None: Вивід команди або None, якщо демон не запущено
+    """
+    import socket
+    
+    path = _socket_path()
+    if _socket_foreign(path):  # Не надсилаємо завдання на чужий сокет
+        return None
+    
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        client.sendall(_dumps_line(command))
+        client.shutdown(socket.SHUT_WR)
+        return _recv_all(client).decode('utf-8')
+
 def main():
     """Головна функція програми"""
-    parser = create_parser()
-    
     if len(sys.argv) == 1:
         interactive_mode()
         return
     
+    parser = create_parser()
     args = parser.parse_args()
+    
+    if args.command == 'taskd':
+        serve_daemon()
+        return
+    
     manager = TaskManager()
+    command = vars(args)
+    if os.environ.get("TASKS_DAEMON") == "1":
+        # Демон обслуговує файл завдань з робочого каталогу клієнта, а не власного
+        command["filename"] = os.path.abspath(manager.filename)
+        output = send_to_daemon(command)
+        if output is not None:
+            sys.stdout.write(output)
+            return
+        # Демон не запущено - виконуємо команду локально
+    
     manager.load_tasks()
     
     try:
-        if args.command == 'add':
-            manager.add_task(args.name, args.priority, args.due)
-            manager.save_tasks()
-            print(f"Завдання '{args.name}' додано!")
-        
-        elif args.command == 'list':
-            status = True if args.status == 'completed' else False if args.status == 'active' else None
-            tasks = manager.list_tasks(status, args.priority)
-            if not tasks:
-                print("Немає завдань, що відповідають фільтрам.")
-            else:
-                print("\nСписок завдань:")
-                for task in tasks:
-                    print(task)
-        
-        elif args.command == 'complete':
-            if manager.complete_task(args.id):
-                print(f"Завдання з ID {args.id} позначено як виконане!")
-            else:
-                print(f"Завдання з ID {args.id} не знайдено.")
-            manager.save_tasks()
-        
-        elif args.command == 'delete':
-            if manager.delete_task(args.id):
-                print(f"Завдання з ID {args.id} видалено!")
-            else:
-                print(f"Завдання з ID {args.id} не знайдено.")
-            manager.save_tasks()
-        
-        elif args.command == 'stats':
-            manager.get_statistics()
-        
-        else:
+        if not execute_command(manager, command):
             parser.print_help()
     
     except KeyboardInterrupt: